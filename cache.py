@@ -0,0 +1,96 @@
+import functools
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir() -> Path:
+    """
+    Return the directory cache files are stored in.
+
+    Uses `$XDG_CACHE_HOME/sync-doge-scrape`, falling back to `~/.cache/sync-doge-scrape`.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "sync-doge-scrape"
+
+
+class Caches:
+    """
+    A named JSON file of cache entries, e.g. `~/.cache/sync-doge-scrape/github.json`.
+
+    Each entry is a dict stored under a string key. The file is re-read on every
+    lookup and rewritten atomically on every store, so separate runs never see a
+    half-written cache. Failing to write is logged and otherwise ignored: the cache
+    only ever saves work, it never changes results.
+    """
+
+    def __init__(self, name: str):
+        self.path = get_cache_dir() / f"{name}.json"
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self._load().get(key)
+
+    def set(self, key: str, entry: Dict) -> None:
+        self.update({key: entry})
+
+    def update(self, new_entries: Dict[str, Dict]) -> None:
+        """Store several entries with a single read and rewrite of the cache file."""
+        entries = self._load()
+        entries.update(new_entries)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write cache {self.path}: {e}")
+
+
+def disk_cached(ttl: float, name: str = "github") -> Callable:
+    """
+    Cache a function's JSON-serializable return value on disk for `ttl` seconds.
+
+    The cache key is a hash of the function name and its arguments. The wrapped
+    function accepts an extra `refresh=True` keyword that skips the cache lookup
+    but still stores the fresh result.
+
+    Args:
+        ttl: How long a cached result stays valid, in seconds.
+        name: Name of the cache file to store entries in (default: 'github').
+    """
+    cache = Caches(name)
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, refresh: bool = False, **kwargs) -> Any:
+            key_source = f"{fn.__name__}:{args}:{sorted(kwargs.items())}"
+            key = hashlib.sha1(key_source.encode()).hexdigest()
+            now = time.time()
+
+            if not refresh:
+                entry = cache.get(key)
+                if entry and now - entry["ts"] < ttl:
+                    logger.debug(f"Using cached {fn.__name__} result")
+                    return entry["data"]
+
+            data = fn(*args, **kwargs)
+            cache.set(key, {"ts": now, "data": data})
+            return data
+
+        return wrapper
+
+    return decorator
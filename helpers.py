@@ -1,22 +1,68 @@
+import json
 import logging
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import requests
 from bln import Client
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cache import Caches
 
-logging.basicConfig(
-    format="\n%(asctime)s %(levelname)s: %(message)s",
-    level=logging.DEBUG,
-    datefmt="%I:%M:%S",
-)
 logger = logging.getLogger(__name__)
 
 
+def create_session(pool_maxsize: int = 20, total_retries: int = 3) -> requests.Session:
+    """
+    Build a requests Session with a pooled, retrying HTTPS adapter.
+
+    Reusing one session keeps connections to the same host alive between calls,
+    so repeated GitHub requests skip the TCP + TLS handshake. Responses with
+    429/5xx statuses are retried with exponential backoff.
+
+    Args:
+        pool_maxsize: Connections kept open per host; match to the threads sharing the session.
+        total_retries: Maximum retries per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(
+            total=total_retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = create_session()
+
+# Aliased history lookups per GraphQL request, well under GitHub's node limits
+GRAPHQL_BATCH_SIZE = 100
+
+# Last-commit timestamps per (repo, ref), valid only for the commit SHA stored with them
+_GITHUB_LAST_COMMITS = Caches("github-last-commits")
+
+# Last ETag and body per GitHub REST URL, for conditional requests
+_GITHUB_ETAGS = Caches("github-etags")
+
+# Pause before a GitHub API call once this few requests remain in the rate-limit window,
+# but only if the window resets within GITHUB_MAX_RATE_LIMIT_WAIT seconds
+GITHUB_RATE_LIMIT_FLOOR = 5
+GITHUB_MAX_RATE_LIMIT_WAIT = 300  # seconds
+# Latest budget per rate-limit resource ('core' for REST, 'graphql'); they are counted separately
+_github_rate_limits = {}
+
+
 def set_environment():
     """
     Load and validate environment variables from a `.env.<env>` file based on a required command-line argument.
@@ -71,6 +117,69 @@ def set_environment():
     return env
 
 
+def _record_github_rate_limit(resp: requests.Response) -> None:
+    """Remember the rate-limit budget GitHub reported on its latest API response."""
+    remaining = resp.headers.get("X-RateLimit-Remaining")
+    reset = resp.headers.get("X-RateLimit-Reset")
+    if remaining is not None and reset is not None:
+        resource = resp.headers.get("X-RateLimit-Resource", "core")
+        _github_rate_limits[resource] = {
+            "remaining": int(remaining),
+            "reset": int(reset),
+        }
+
+
+def _wait_for_github_rate_limit(resource: str = "core") -> None:
+    """
+    Sleep until GitHub's rate-limit window for `resource` resets, but only when the
+    last response for it said the budget is nearly spent. Otherwise return immediately.
+    """
+    limit = _github_rate_limits.get(resource)
+    if limit is None or limit["remaining"] > GITHUB_RATE_LIMIT_FLOOR:
+        return
+    remaining = limit["remaining"]
+    wait = limit["reset"] - time.time() + 1
+    if wait <= 0:
+        return
+    if wait > GITHUB_MAX_RATE_LIMIT_WAIT:
+        logger.warning(
+            f"GitHub rate limit nearly spent ({remaining} left) and resets in {wait:.0f}s; "
+            "set GITHUB_TOKEN for a higher limit"
+        )
+        return
+    logger.info(f"GitHub rate limit nearly spent; waiting {wait:.0f}s for reset")
+    time.sleep(wait)
+
+
+def get_github_json(url: str, headers: Dict[str, str], params: Dict) -> Any:
+    """
+    GET a GitHub REST endpoint and return its parsed JSON body.
+
+    Sends the ETag from the previous response as `If-None-Match`. GitHub answers an
+    unchanged resource with an empty 304, which does not count against the rate limit,
+    and the body stored alongside the ETag is returned instead.
+    """
+    key = requests.Request("GET", url, params=params).prepare().url
+    cached = _GITHUB_ETAGS.get(key)
+    request_headers = dict(headers)
+    if cached:
+        request_headers["If-None-Match"] = cached["etag"]
+
+    _wait_for_github_rate_limit()
+    resp = _SESSION.get(url, headers=request_headers, params=params)
+    _record_github_rate_limit(resp)
+    if resp.status_code == 304 and cached:
+        logger.debug(f"GitHub resource not modified: {key}")
+        return cached["data"]
+    resp.raise_for_status()
+    data = resp.json()
+
+    etag = resp.headers.get("ETag")
+    if etag:
+        _GITHUB_ETAGS.set(key, {"etag": etag, "data": data})
+    return data
+
+
 def list_github_dir(
     owner: str, repo: str, path: str, ref: str = "main", token: Optional[str] = None
 ) -> List[Dict]:
@@ -88,9 +197,7 @@ def list_github_dir(
     if token:
         headers["Authorization"] = f"token {token}"
 
-    resp = requests.get(url, headers=headers, params={"ref": ref})
-    resp.raise_for_status()
-    items = resp.json()
+    items = get_github_json(url, headers, params={"ref": ref})
 
     files = []
     for item in items:
@@ -105,6 +212,15 @@ def list_github_dir(
     return files
 
 
+def format_commit_timestamp(raw_ts: str) -> str:
+    """
+    Convert a GitHub commit date (e.g., "2025-02-18T23:25:13Z") to the compact
+    timestamp used in versioned BLN filenames (e.g., "2025-02-18T232513").
+    """
+    dt = datetime.fromisoformat(raw_ts.replace("Z", "+00:00"))  # Handle UTC time with Z
+    return dt.strftime("%Y-%m-%dT%H%M%S")
+
+
 def get_last_commit_dates(
     owner: str,
     repo: str,
@@ -115,38 +231,204 @@ def get_last_commit_dates(
     """
     Given a list of file paths in a GitHub repo, return the last commit timestamp for each.
 
+    With a token, paths are resolved with batched GraphQL requests, and only paths
+    the GraphQL API failed to resolve are looked up over REST. Without one (GitHub's
+    GraphQL API requires auth), makes one REST call per path.
+
     Returns:
         Dict mapping file path to a compact ISO-style timestamp (e.g., 2025-02-18T232513).
     """
     headers = {"Accept": "application/vnd.github+json"}
-    if token:
-        headers["Authorization"] = f"token {token}"
 
     commit_dates = {}
+    if token:
+        commit_dates = get_last_commit_dates_graphql(
+            owner, repo, file_paths, ref, token
+        )
+        file_paths = [path for path in file_paths if path not in commit_dates]
+        if not file_paths:
+            return commit_dates
+        logger.warning(
+            f"GraphQL did not resolve {len(file_paths)} path(s); falling back to REST"
+        )
+        headers["Authorization"] = f"Bearer {token}"
+
     for path in file_paths:
         url = f"https://api.github.com/repos/{owner}/{repo}/commits"
-        resp = requests.get(
-            url, headers=headers, params={"path": path, "sha": ref, "per_page": 1}
+        data = get_github_json(
+            url, headers, params={"path": path, "sha": ref, "per_page": 1}
         )
-        resp.raise_for_status()
-        data = resp.json()
 
         if data:
             raw_ts = data[0]["commit"]["committer"][
                 "date"
             ]  # e.g., "2025-02-18T23:25:13Z"
-            dt = datetime.fromisoformat(
-                raw_ts.replace("Z", "+00:00")
-            )  # Handle UTC time with Z
-            formatted_ts = dt.strftime("%Y-%m-%dT%H%M%S")  # e.g., "2025-02-18T232513"
-            commit_dates[path] = formatted_ts
+            commit_dates[path] = format_commit_timestamp(raw_ts)
+        else:
+            commit_dates[path] = None
+
+    return commit_dates
+
+
+def get_ref_commit_sha(
+    owner: str, repo: str, ref: str = "main", token: Optional[str] = None
+) -> str:
+    """
+    Resolve a branch, tag, or SHA to the full SHA of the commit it points at.
+    """
+    headers = {"Accept": "application/vnd.github.sha"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    _wait_for_github_rate_limit()
+    resp = _SESSION.get(
+        f"https://api.github.com/repos/{owner}/{repo}/commits/{ref}", headers=headers
+    )
+    _record_github_rate_limit(resp)
+    resp.raise_for_status()
+    return resp.text.strip()
+
+
+def get_cached_last_commit_dates(
+    owner: str,
+    repo: str,
+    file_paths: List[str],
+    ref: str = "main",
+    token: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Like get_last_commit_dates, but reuses timestamps looked up at the same commit.
+
+    `ref` is resolved to its commit SHA first, and cached timestamps are only reused
+    while `ref` still points at that commit. Lookups themselves stay on `ref` rather
+    than the SHA, so their URLs (and ETag cache entries) don't change with every commit.
+    The cache keeps one entry per (repo, ref), holding only the latest commit's
+    timestamps, so it never grows past one directory listing.
+
+    Returns:
+        Dict mapping file path to a compact ISO-style timestamp (e.g., 2025-02-18T232513).
+    """
+    commit_sha = get_ref_commit_sha(owner, repo, ref=ref, token=token)
+    key = f"{owner}/{repo}@{ref}"
+    entry = _GITHUB_LAST_COMMITS.get(key)
+    cached = entry["dates"] if entry and entry["sha"] == commit_sha else {}
+
+    commit_dates = {path: cached[path] for path in file_paths if path in cached}
+    missing_paths = [path for path in file_paths if path not in cached]
+
+    if missing_paths:
+        logger.info(
+            f"Looking up last commit dates for {len(missing_paths)} file(s) at {commit_sha[:7]}"
+        )
+        fetched = get_last_commit_dates(
+            owner, repo, missing_paths, ref=ref, token=token
+        )
+        commit_dates.update(fetched)
+        _GITHUB_LAST_COMMITS.set(
+            key,
+            {
+                "sha": commit_sha,
+                "dates": {path: ts for path, ts in commit_dates.items() if ts},
+            },
+        )
+
+    return commit_dates
+
+
+def get_last_commit_dates_graphql(
+    owner: str,
+    repo: str,
+    file_paths: List[str],
+    ref: str,
+    token: str,
+) -> Dict[str, str]:
+    """
+    Look up the last commit timestamp for every path with batched GitHub GraphQL requests.
+
+    Each path becomes an aliased `history(first: 1, path: ...)` selection on the
+    commit that `ref` resolves to, so every GRAPHQL_BATCH_SIZE files cost one
+    round-trip (and one rate-limit point) instead of one each.
+
+    A batch that fails outright is logged and skipped, so one bad request does not
+    throw away the batches that succeeded.
+
+    Returns:
+        Dict mapping file path to a compact ISO-style timestamp, or None if the
+        path has no commits on `ref`. Paths that could not be resolved are omitted.
+    """
+    commit_dates = {}
+    for start in range(0, len(file_paths), GRAPHQL_BATCH_SIZE):
+        batch = file_paths[start : start + GRAPHQL_BATCH_SIZE]
+        try:
+            commit_dates.update(
+                _query_last_commit_dates(owner, repo, batch, ref, token)
+            )
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"GitHub GraphQL batch of {len(batch)} path(s) failed: {e}")
+    return commit_dates
+
+
+def _query_last_commit_dates(
+    owner: str,
+    repo: str,
+    file_paths: List[str],
+    ref: str,
+    token: str,
+) -> Dict[str, str]:
+    """
+    Run a single GraphQL query resolving the last commit timestamp of each path.
+
+    GraphQL can return partial data alongside errors; paths whose selection came
+    back null are left out of the result rather than failing the whole batch.
+    """
+    # json.dumps produces a valid GraphQL string literal for each path
+    selections = "\n".join(
+        f"f{i}: history(first: 1, path: {json.dumps(path)}) {{ nodes {{ committedDate }} }}"
+        for i, path in enumerate(file_paths)
+    )
+    query = f"""
+    query($owner: String!, $name: String!, $ref: String!) {{
+      repository(owner: $owner, name: $name) {{
+        object(expression: $ref) {{
+          ... on Commit {{
+            {selections}
+          }}
+        }}
+      }}
+    }}
+    """
+    _wait_for_github_rate_limit("graphql")
+    resp = _SESSION.post(
+        "https://api.github.com/graphql",
+        headers={"Authorization": f"bearer {token}"},
+        json={
+            "query": query,
+            "variables": {"owner": owner, "name": repo, "ref": ref},
+        },
+    )
+    _record_github_rate_limit(resp)
+    resp.raise_for_status()
+    payload = resp.json()
+    if payload.get("errors"):
+        logger.warning(f"GitHub GraphQL error: {payload['errors']}")
+
+    repository = (payload.get("data") or {}).get("repository") or {}
+    commit = repository.get("object") or {}
+    commit_dates = {}
+    for i, path in enumerate(file_paths):
+        history = commit.get(f"f{i}")
+        if history is None:
+            continue
+        nodes = history.get("nodes", [])
+        if nodes:
+            commit_dates[path] = format_commit_timestamp(nodes[0]["committedDate"])
         else:
             commit_dates[path] = None
 
     return commit_dates
 
 
-def list_bln_project_files(client: Client, project_id: str) -> List[Dict[str, str]]:
+def list_bln_project_files(client: Client, project_id: str) -> Set[str]:
     """
     List files currently uploaded to a BLN project.
 
@@ -155,11 +437,7 @@ def list_bln_project_files(client: Client, project_id: str) -> List[Dict[str, st
         project_id (str): The BLN project ID.
 
     Returns:
-        list of filenames
+        set of filenames, for O(1) membership checks against GitHub files
     """
     project = client.get_project_by_id(project_id)
-    current_files = []
-    for f in project.get("files", []):
-        current_files.append(f["name"])
-
-    return current_files
+    return {f["name"] for f in project.get("files", [])}
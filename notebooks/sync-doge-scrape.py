@@ -3,6 +3,7 @@
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from time import sleep
 from urllib.parse import urlparse
 
@@ -102,23 +103,29 @@ else:
 
 
 
-for file_to_send in tqdm(files_to_send):
+session = requests.Session()    # Reuse connections across downloads
+
+
+def download_file(file_to_send, localurl):
     # Get the file if it's not already here
     if os.path.exists(datadir + file_to_send):
-        got_file = True
-    else:
-        got_file = False
-        localurl = files_to_send[file_to_send]
-        r = requests.get(localurl)
-        if not r.ok:
-            print(f"Failure downloading {localurl}")
-        else:
-            got_file = True
-            with open(datadir + file_to_send, "wb") as outfile:
-                outfile.write(r.content)
-    if got_file:
-        bln.upload_file(project_id, datadir + file_to_send)
-    sleep(1)
+        return True
+    r = session.get(localurl)
+    if not r.ok:
+        print(f"Failure downloading {localurl}")
+        return False
+    with open(datadir + file_to_send, "wb") as outfile:
+        outfile.write(r.content)
+    return True
+
+
+# Download in parallel; upload each file as soon as it lands, pausing between uploads to go easy on BLN
+with ThreadPoolExecutor(max_workers=8) as executor:
+    futures = {executor.submit(download_file, file_to_send, localurl): file_to_send for file_to_send, localurl in files_to_send.items()}
+    for future in tqdm(as_completed(futures), total=len(futures)):
+        if future.result():
+            bln.upload_file(project_id, datadir + futures[future])
+            sleep(1)
 
 
 
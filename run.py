@@ -1,4 +1,6 @@
 import logging
+import multiprocessing
+import os
 
 from helpers import set_environment
 from sync_doge_scrape import run_pipeline
@@ -10,14 +12,28 @@ Looks for new data in https://github.com/m-nolan/doge-scraper/data and
 uploads anything missing to Big Local News project.
 """
 
-logging.basicConfig(
-    format="\n%(asctime)s %(levelname)s: %(message)s",
-    level=logging.DEBUG,
-    datefmt="%H:%M:%S",
-)
 logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
-    logger.debug("Running sync-doge-scrape...")
+    # Configure logging here rather than at import time, so importing the pipeline
+    # modules elsewhere doesn't reconfigure the root logger
+    logging.basicConfig(
+        format="\n%(asctime)s %(levelname)s: %(message)s",
+        level=logging.INFO,
+        datefmt="%H:%M:%S",
+    )
+    # urllib3 logs every connection at DEBUG; keep it quiet even when debugging
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+    # The BLN client starts a multiprocessing pool per upload, and uploads run from
+    # threads; start its workers from a clean server process instead of forking this one
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method("forkserver")
     environment = set_environment()
+    # Applied after set_environment so LOG_LEVEL can also come from .env.<env>
+    log_level = os.environ.get("LOG_LEVEL", "INFO").strip().upper()
+    if isinstance(logging.getLevelName(log_level), int):
+        logging.getLogger().setLevel(log_level)
+    else:
+        logger.warning(f"Unknown LOG_LEVEL '{log_level}'; using INFO")
+    logger.debug("Running sync-doge-scrape...")
     run_pipeline(environment)
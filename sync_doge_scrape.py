@@ -1,24 +1,48 @@
 import logging
 import os
 import tempfile
-from collections import defaultdict
-from time import sleep
-from typing import Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import requests
 from bln import Client
 
 from bots.slack_alerts import SlackInternalAlert
-from helpers import get_last_commit_dates, list_bln_project_files, list_github_dir
-
-logging.basicConfig(
-    format="\n%(asctime)s %(levelname)s: %(message)s",
-    level=logging.DEBUG,
-    datefmt="%H:%M:%S",
+from cache import disk_cached
+from helpers import (
+    create_session,
+    get_cached_last_commit_dates,
+    list_bln_project_files,
+    list_github_dir,
 )
+
 logger = logging.getLogger(__name__)
 
+DOWNLOAD_CHUNK_SIZE = 65536  # bytes
+DOWNLOAD_TIMEOUT = (5, 60)  # (connect, read) seconds
+
+# Log upload progress every N files rather than per file (failures are always logged)
+PROGRESS_LOG_EVERY = 16
+
+# GitHub listings change at most a few times a day; reuse results across back-to-back runs
+GITHUB_CACHE_TTL = 600  # seconds
+
+
+def versioned_filename(name: str, timestamp: Optional[str]) -> str:
+    """
+    Insert a commit timestamp before a filename's extension.
 
+    e.g. ('doge-contract.csv', '2025-06-29T204434') -> 'doge-contract_2025-06-29T204434.csv'.
+    Only the last dot counts as the extension separator; names without one get the
+    timestamp appended.
+    """
+    base_name, dot, ext = name.rpartition(".")
+    if not dot:
+        return f"{name}_{timestamp}"
+    return f"{base_name}_{timestamp}.{ext}"
+
+
+@disk_cached(ttl=GITHUB_CACHE_TTL)
 def get_files_with_last_modified(
     owner: str, repo: str, path: str, ref: str = "main", token: Optional[str] = None
 ) -> List[Dict[str, str]]:
@@ -31,6 +55,8 @@ def get_files_with_last_modified(
         path: Directory path within the repo to list files from (e.g., 'data').
         ref: Branch name or commit SHA to use as the reference point (default: 'main').
         token: Optional GitHub token for authenticated API access.
+        refresh: Keyword-only, added by `disk_cached`. The enriched listing is cached on disk
+                 for GITHUB_CACHE_TTL seconds; pass refresh=True to refetch (and re-cache) it.
 
     Returns:
         A dict keyed by comparison filename (e.g., 'doge-contract_2025-06-29T204434.csv'),
@@ -41,39 +67,34 @@ def get_files_with_last_modified(
             - 'name': str — original filename
     """
     files = list_github_dir(owner, repo, path, ref=ref, token=token)
-    file_paths = [f["path"] for f in files]
-    last_modified = get_last_commit_dates(owner, repo, file_paths, ref=ref, token=token)
-
-    enriched = defaultdict(dict)
-    for f in files:
-        timestamp = last_modified.get(f["path"])
-        name = f["name"]
-        path = f["path"]
-        download_url = f["download_url"]
-        base_name, ext = name.split(".")
-        comparison_name = f"{base_name}_{timestamp}.{ext}"
-        enriched[comparison_name] = {
-            "path": path,
-            "download_url": download_url,
+    last_modified = get_cached_last_commit_dates(
+        owner, repo, [f["path"] for f in files], ref=ref, token=token
+    )
+
+    return {
+        versioned_filename(f["name"], timestamp): {
+            "path": f["path"],
+            "download_url": f["download_url"],
             "timestamp": timestamp,
-            "name": name,
+            "name": f["name"],
         }
-    return enriched
+        for f in files
+        for timestamp in [last_modified.get(f["path"])]
+    }
 
 
 def get_new_github_files_for_bln(
-    bln_file_names: List[str], github_files: Dict[str, Dict]
+    bln_file_names: Iterable[str], github_files: Dict[str, Dict]
 ) -> Dict[str, Dict]:
     """
     Identify which GitHub-hosted files are not yet present in the BLN project and should be uploaded.
 
     Compares the list of existing file names in BLN ploject against the versioned filenames
-    from GitHub and returns only those that are new. Also logs a summary message
-    and sends a Slack alert with the count of new files found.
+    from GitHub and returns only those that are new. Also logs the count of new files found.
 
     Args:
-        bln_file_names: List of filenames currently in the BLN project
-                        (e.g., ['doge-contract_2025-06-29T204434.csv']).
+        bln_file_names: Filenames currently in the BLN project, as returned by
+                        list_bln_project_files (e.g., {'doge-contract_2025-06-29T204434.csv'}).
         github_files: Dict of GitHub files keyed by versioned BLN-style filename
                       (e.g., 'doge-contract_2025-06-29T204434.csv'), with values containing:
                           {
@@ -87,12 +108,12 @@ def get_new_github_files_for_bln(
         Dict of new GitHub files (not yet present in BLN), keyed by versioned filename.
     """
 
-    bln_file_set = set(bln_file_names)
-    new_files = {}
-
-    for filename, metadata in github_files.items():
-        if filename not in bln_file_set:
-            new_files[filename] = metadata
+    bln_file_set = frozenset(bln_file_names)
+    new_files = {
+        filename: metadata
+        for filename, metadata in github_files.items()
+        if filename not in bln_file_set
+    }
 
     message = f"{len(new_files)} new files found"
     logger.info(message)
@@ -100,18 +121,90 @@ def get_new_github_files_for_bln(
     return new_files
 
 
+def download_github_file(
+    filename: str, metadata: Dict[str, str], tmpdir: str, session: requests.Session
+) -> Optional[str]:
+    """
+    Download a single GitHub-hosted file into `tmpdir` under its versioned filename.
+
+    Args:
+        filename: Versioned BLN-style filename (e.g., "doge-contract_2025-06-29T204434.csv").
+        metadata: GitHub file metadata; only 'download_url' is used.
+        tmpdir: Directory to write the file into.
+        session: Shared requests Session, so downloads reuse pooled connections.
+
+    Returns:
+        The local path of the downloaded file, or None if the download failed.
+    """
+    local_path = os.path.join(tmpdir, filename)
+    try:
+        with session.get(
+            metadata["download_url"], stream=True, timeout=DOWNLOAD_TIMEOUT
+        ) as response:
+            if not response.ok:
+                logger.error(
+                    f"❌ Failed to download {filename} — Status code: {response.status_code}"
+                )
+                return None
+
+            # Write in chunks so memory stays flat regardless of file size;
+            # iter_content wraps dropped or stalled connections in requests exceptions
+            with open(local_path, "wb") as f:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+    except (requests.RequestException, OSError) as e:
+        logger.error(f"❌ Failed to download {filename}: {e}")
+        return None
+    return local_path
+
+
+def upload_file_to_bln(
+    client: Client, project_id: str, filename: str, local_path: str
+) -> bool:
+    """
+    Upload a single downloaded file to the BLN project.
+
+    Args:
+        client: An initialized instance of the BLN API Client.
+        project_id: The unique BLN project ID to upload into.
+        filename: Versioned BLN-style filename, used for logging.
+        local_path: Path of the downloaded file; its basename becomes the BLN filename.
+
+    Returns:
+        True if the upload succeeded, False otherwise.
+    """
+    try:
+        client.upload_file(project_id, local_path)
+    except Exception as e:
+        logger.error(f"❌ Failed to upload {filename}: {e}")
+        return False
+    return True
+
+
 def copy_github_files_to_bln(
     github_files: Dict[str, Dict],
     client: Client,
     project_id: str,
-    slackbot_alerter,
-    delay_seconds: float = 1.0,
-) -> None:
+    max_downloads: int = 4,
+    max_uploads: int = 2,
+    max_buffered_files: int = 8,
+    session: Optional[requests.Session] = None,
+) -> Tuple[List[str], List[str]]:
     """
     Download and upload GitHub-hosted files to the BLN project.
 
-    Each file is downloaded to a temporary location (retaining its versioned filename) and uploaded to BLN.
-    Slack alerts are posted summarizing which files were successfully uploaded and which (if any) failed.
+    Files are downloaded concurrently to a temporary location (retaining their versioned
+    filenames). Each file is handed to a small pool of upload threads as soon as its
+    download completes, so uploads overlap with each other and with the downloads still
+    in flight. On Linux the BLN client starts a multiprocessing pool for every upload_file
+    call; run.py selects the 'forkserver' start method so those pools are never forked
+    from this multithreaded process.
+    At most `max_buffered_files` files are on disk at once (downloading, waiting, or
+    uploading); each is deleted once uploaded, so downloads never run far ahead of BLN.
+    There is no fixed delay between uploads: the BLN client already retries a failed
+    upload with exponential backoff.
+    Nothing is posted to Slack from here; run_pipeline folds the returned results into its
+    single end-of-run alert.
 
     Args:
         github_files: Dict of GitHub files to upload, keyed by versioned BLN-style filename
@@ -125,48 +218,106 @@ def copy_github_files_to_bln(
 
         client: An initialized instance of the BLN API Client.
         project_id: The unique BLN project ID where the files will be uploaded.
-        slackbot_alerter: A callable or bot object
-        delay_seconds: Optional delay between uploads (default: 1.0 second) to avoid rate limiting or API overload.
+        max_downloads: Maximum number of concurrent GitHub downloads (default: 4).
+        max_uploads: Maximum number of concurrent BLN uploads (default: 2, to respect BLN rate limits).
+        max_buffered_files: Maximum number of files downloading, waiting, or uploading at
+                            once (default: 8).
+        session: requests Session used for downloads. Defaults to a new pooled session
+                 from `create_session` with one connection per download thread; pass one
+                 in to reuse its connections across calls.
+
+    Returns:
+        A (successes, failures) tuple of versioned filenames.
 
     Behavior:
-        - If no files are passed, logs and sends a Slack "notice" stating that no new files were found.
-        - After processing, logs and alerts on the number of successful and failed uploads.
+        - After processing, logs the successful and failed uploads.
     """
-    uploads = {"success": [], "failure": []}
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        for filename, metadata in github_files.items():
-            logger.info(f"⬇️ Downloading {filename} ...")
-            response = requests.get(metadata["download_url"])
-            if not response.ok:
-                logger.error(
-                    f"❌ Failed to download {filename} — Status code: {response.status_code}"
-                )
-                uploads["failure"].append(filename)
-                continue
-
-            local_path = os.path.join(tmpdir, filename)
+    if session is None:
+        # One pooled session for every download, sized to the download threads
+        # and closed once the copy finishes or fails
+        with create_session(pool_maxsize=max_downloads, total_retries=5) as session:
+            return copy_github_files_to_bln(
+                github_files,
+                client,
+                project_id,
+                max_downloads,
+                max_uploads,
+                max_buffered_files,
+                session,
+            )
+
+    successes, failures = [], []
+
+    def upload(filename: str, local_path: str) -> bool:
+        try:
+            return upload_file_to_bln(client, project_id, filename, local_path)
+        finally:
             try:
-                with open(local_path, "wb") as f:
-                    f.write(response.content)
-
-                logger.info(f"⬆️ Uploading {filename} to BLN ...")
-                client.upload_file(project_id, local_path)
-                uploads["success"].append(filename)
-
-            except Exception as e:
-                logger.error(f"❌ Failed to upload {filename}: {e}")
-                uploads["failure"].append(filename)
-
-            sleep(delay_seconds)  # avoid overloading the API
-
-    if uploads["success"]:
-        message = f"{len(uploads['success'])} new files uploaded to BLN project ({uploads['success']})"
+                os.remove(local_path)
+            except OSError:
+                pass  # the temp dir is removed at the end anyway
+
+    total = len(github_files)
+    done = 0
+    pending = iter(github_files.items())
+    # Files downloading, and files downloaded and waiting for or in an upload. Only this
+    # thread adds to or removes from them, so no worker ever blocks waiting for room.
+    downloads, uploads = {}, {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        download_pool = ThreadPoolExecutor(max_workers=max_downloads)
+        upload_pool = ThreadPoolExecutor(max_workers=max_uploads)
+        try:
+            while True:
+                # Top up the buffer before waiting on the next download or upload
+                while len(downloads) + len(uploads) < max_buffered_files:
+                    item = next(pending, None)
+                    if item is None:
+                        break
+                    filename, metadata = item
+                    future = download_pool.submit(
+                        download_github_file, filename, metadata, tmpdir, session
+                    )
+                    downloads[future] = filename
+                if not downloads and not uploads:
+                    break
+
+                finished, _ = wait([*downloads, *uploads], return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future in downloads:
+                        filename = downloads.pop(future)
+                        local_path = future.result()
+                        if local_path is not None:
+                            # Upload as soon as the download lands, while the rest keep downloading
+                            upload_future = upload_pool.submit(
+                                upload, filename, local_path
+                            )
+                            uploads[upload_future] = filename
+                            continue
+                        failures.append(filename)
+                    else:
+                        filename = uploads.pop(future)
+                        if future.result():
+                            successes.append(filename)
+                        else:
+                            failures.append(filename)
+                    done += 1
+                    if done % PROGRESS_LOG_EVERY == 0 or done == total:
+                        logger.info(f"⬆️ {done}/{total} files processed")
+        finally:
+            # Drop queued work if anything above raised; wait for running downloads and
+            # uploads before the temp dir is removed
+            for future in [*downloads, *uploads]:
+                future.cancel()
+            download_pool.shutdown(wait=True)
+            upload_pool.shutdown(wait=True)
+
+    if successes:
+        message = f"{len(successes)} new files uploaded to BLN project ({successes})"
         logger.info(message)
-    if uploads["failure"]:
-        message = f"New files failed upload to BLN: {uploads['failure']}"
+    if failures:
+        message = f"New files failed upload to BLN: {failures}"
         logger.info(message)
-    return uploads
+    return successes, failures
 
 
 def run_pipeline(environment):
@@ -174,23 +325,26 @@ def run_pipeline(environment):
     Orchestrates the full pipeline to sync updated files from a GitHub directory into a BLN project.
 
     Steps:
-        1. Logs and alerts the start of the run.
+        1. Logs the start of the run.
         2. Fetches the list of files in the source GitHub repo (with last-modified timestamps).
-        3. Fetches the list of current files in the target BLN project.
+        3. Fetches the list of current files in the target BLN project (concurrently with step 2).
         4. Compares the two to determine which GitHub files are new.
         5. Downloads and uploads new files to the BLN project.
-        6. Logs and alerts the result of the operation.
+        6. Logs the result and posts it to Slack as a single alert.
 
     Args:
         environment: The environment label (e.g. 'prod', 'test') used for logging and alert context.
 
     Assumptions:
         - `BLN_API_TOKEN` and `BLN_PROJECT_ID` are available in the environment.
+        - `GITHUB_TOKEN` is optional; when set, GitHub lookups are authenticated and
+          last-commit dates are fetched in one GraphQL request.
         - GitHub source repo is 'm-nolan/doge-scrape', targeting the 'data/' directory.
         - Uses SlackInternalAlert for operational notifications.
 
     Side Effects:
-        - Posts notices and success/failure alerts to Slack.
+        - Posts one success/error alert to Slack at the end of the run, so Slack's
+          round-trip stays off the critical path of the sync itself.
         - Logs detailed sync status using the configured logger.
         - Uploads any new GitHub-hosted files to BLN.
     """
@@ -199,24 +353,30 @@ def run_pipeline(environment):
     bln_api_key = os.environ.get("BLN_API_TOKEN")
     bln_project_id = os.environ.get("BLN_PROJECT_ID")
     bln_client = Client(bln_api_key)
+    github_token = os.environ.get("GITHUB_TOKEN")
     source_repo = "doge-scrape"
     source_repo_owner = "m-nolan"
     source_data_path = "data"
 
     SLACK_BOT_INTERNAL_ALERTER = SlackInternalAlert("doge-scrape")
 
-    github_files = get_files_with_last_modified(
-        source_repo_owner,
-        source_repo,
-        path=source_data_path,
-    )
+    # GitHub and BLN are independent services, so list both at once
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        github_future = executor.submit(
+            get_files_with_last_modified,
+            source_repo_owner,
+            source_repo,
+            path=source_data_path,
+            token=github_token,
+        )
+        bln_future = executor.submit(list_bln_project_files, bln_client, bln_project_id)
+        github_files = github_future.result()
+        bln_project_files = bln_future.result()
 
     message = (
         f"Files found in '{source_repo}/{source_data_path}' github: {github_files}"
     )
     logger.info(message)
-
-    bln_project_files = list_bln_project_files(bln_client, bln_project_id)
     logger.info(f"Files found in BLN project: {bln_project_files}")
 
     new_github_files = get_new_github_files_for_bln(bln_project_files, github_files)
@@ -225,18 +385,15 @@ def run_pipeline(environment):
     outcome = None
 
     if new_github_files:
-        uploads = copy_github_files_to_bln(
+        success_uploads, failure_uploads = copy_github_files_to_bln(
             github_files=new_github_files,
             client=bln_client,
             project_id=bln_project_id,
-            slackbot_alerter=SLACK_BOT_INTERNAL_ALERTER,
         )
-        if uploads["success"]:
-            success_uploads = uploads["success"]
+        if success_uploads:
             file_upload_message = f"{len(success_uploads)} new/updated file(s) uploaded to BLN project ({', '.join(success_uploads)})"
             outcome = "success"
-        if uploads["failure"]:
-            failure_uploads = uploads["failure"]
+        if failure_uploads:
             file_upload_message = f"{file_upload_message}. {len(failure_uploads)} new/updated file(s) failed to upload to BLN project ({', '.join(failure_uploads)})"
             outcome = "error"
 